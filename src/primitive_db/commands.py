@@ -1,9 +1,34 @@
+import copy
+import functools
+import re
 import shlex
+import sys
 from abc import ABC, abstractmethod
-from typing import Dict, List, Type
+from collections import OrderedDict
+from itertools import repeat
+from operator import methodcaller
+from types import MappingProxyType
+from typing import (
+    Any,
+    Callable,
+    ClassVar,
+    Dict,
+    Final,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+    Type,
+)
 
 from prettytable import PrettyTable
 
+from .constants import (
+    COMMAND_INTERN_SIZE,
+    FAST_FORMAT_THRESHOLD,
+    PARSE_CACHE_SIZE,
+)
 from .core import (
     Database,
     RecordNotFoundError,
@@ -11,6 +36,7 @@ from .core import (
     TableNotFoundError,
     ValidationError,
 )
+from .models import Table
 from .parser import (
     ParseError,
     parse_delete,
@@ -20,15 +46,129 @@ from .parser import (
     parse_update,
 )
 
+# Сообщения об ошибках разбора команд
+_ERR_EMPTY_COMMAND: Final = "Пустая команда"
+_ERR_BAD_COMMAND: Final = "Некорректная команда. Попробуйте снова."
+_ERR_CREATE_ARGS: Final = (
+    "Некорректное значение: недостаточно аргументов. Попробуйте снова."
+)
+_ERR_DROP_ARGS: Final = (
+    "Некорректное значение: неправильное количество аргументов. "
+    "Попробуйте снова."
+)
+_ERR_LIST_ARGS: Final = (
+    "Некорректное значение: команда list_tables не принимает "
+    "аргументов. Попробуйте снова."
+)
+
+# Заготовки PrettyTable с уже настроенными столбцами: имена столбцов -> таблица
+_PT_TEMPLATES: Dict[Tuple[str, ...], PrettyTable] = {}
+
+# Символы, при наличии которых ввод нужно разбирать через shlex
+_QUOTING_RE = re.compile(r"[\"'\\]")
+
 
 class InvalidCommandError(Exception):
     """Исключение для некорректных команд."""
     pass
 
 
+def _split_args(user_input: str) -> List[str]:
+    """
+    Разбить ввод на аргументы.
+    
+    Большинство команд не содержит кавычек и экранирования, поэтому для них
+    хватает str.split; медленный shlex.split используется только когда
+    в строке встречаются кавычки или обратный слеш.
+    
+    Args:
+        user_input: Строка с пользовательским вводом
+        
+    Returns:
+        Список аргументов
+        
+    Raises:
+        ValueError: Если кавычки в строке не сбалансированы
+    """
+    if _QUOTING_RE.search(user_input) is None:
+        return user_input.split()
+    return shlex.split(user_input)
+
+
+def _format_table_fast(
+    column_names: Sequence[str], records: Sequence[Dict[str, Any]]
+) -> str:
+    """
+    Отформатировать записи в таблицу того же вида, что и PrettyTable.
+    
+    Таблица строится по столбцам: значения каждого столбца извлекаются,
+    приводятся к строкам, измеряются и центрируются через map, так что
+    поэлементные циклы выполняются встроенными функциями на C, а не
+    байткодом интерпретатора. Строки таблицы собираются через zip и
+    str.join. В отличие от PrettyTable ширина считается по len(), поэтому
+    символы двойной ширины выравниваются иначе.
+    
+    Args:
+        column_names: Имена столбцов в порядке вывода
+        records: Записи (словари)
+        
+    Returns:
+        Таблица в виде строки
+    """
+    widths = []
+    columns = []
+    
+    for name in column_names:
+        values = list(map(str, map(methodcaller("get", name, ""), records)))
+        width = max(len(name), max(map(len, values), default=0))
+        widths.append(width)
+        columns.append(map(str.center, values, repeat(width)))
+    
+    border = "+" + "+".join(["-" * (width + 2) for width in widths]) + "+"
+    header = " | ".join(map(str.center, column_names, widths))
+    
+    lines = [border, f"| {header} |", border]
+    lines.extend([f"| {row} |" for row in map(" | ".join, zip(*columns))])
+    lines.append(border)
+    
+    return "\n".join(lines)
+
+
+def _new_pretty_table(column_names: Tuple[str, ...]) -> PrettyTable:
+    """
+    Получить пустую PrettyTable с заданными столбцами.
+    
+    Установка field_names пересоздаёт настройки выравнивания и ширины для
+    всех столбцов, поэтому для каждого набора столбцов таблица настраивается
+    один раз, а затем копируется. Поверхностной копии достаточно: строки
+    сбрасываются через clear_rows, а настройки столбцов не изменяются.
+    
+    Args:
+        column_names: Имена столбцов в порядке вывода
+        
+    Returns:
+        Новая PrettyTable без строк
+    """
+    template = _PT_TEMPLATES.get(column_names)
+    if template is None:
+        template = PrettyTable()
+        template.field_names = column_names
+        _PT_TEMPLATES[column_names] = template
+    
+    pt = copy.copy(template)
+    pt.clear_rows()
+    return pt
+
+
 class DatabaseCommand(ABC):
     """Абстрактный базовый класс для команд базы данных."""
     
+    # Команды создаются на каждый ввод, поэтому атрибуты хранятся в слотах
+    __slots__ = ()
+    
+    # Имя команды, которое запускает данную команду
+    COMMAND_NAME: ClassVar[str]
+    
     @abstractmethod
     def execute(self, db: Database) -> str:
         """
@@ -48,6 +188,9 @@ class DatabaseCommand(ABC):
         """
         Создать экземпляр команды из пользовательского ввода.
         
+        Имя команды уже проверено реестром при выборе класса команды,
+        поэтому повторно его сравнивать не нужно.
+        
         Args:
             args: Список аргументов команды (первый элемент - имя команды)
             
@@ -60,18 +203,47 @@ class DatabaseCommand(ABC):
         pass
     
     @classmethod
-    @abstractmethod
+    def from_raw(cls, user_input: str) -> "DatabaseCommand":
+        """
+        Создать экземпляр команды из исходной строки ввода.
+        
+        По умолчанию строка разбивается на аргументы и передаётся
+        в from_input; команды с одинаковыми аргументами разделяют один
+        экземпляр (см. _intern_command). SQL-подобные команды
+        переопределяют метод и разбирают строку своим парсером, минуя
+        разбиение на аргументы.
+        
+        Args:
+            user_input: Строка с пользовательским вводом без крайних пробелов
+            
+        Returns:
+            Экземпляр команды
+            
+        Raises:
+            InvalidCommandError: Если ввод некорректен для данной команды
+        """
+        try:
+            args = _split_args(user_input)
+        except ValueError:
+            raise InvalidCommandError(_ERR_BAD_COMMAND)
+        
+        return _intern_command(cls, tuple(args))
+    
+    @classmethod
     def get_command_name(cls) -> str:
         """Получить имя команды, которое запускает данную команду."""
-        pass
+        return cls.COMMAND_NAME
 
 
 class CreateTableCommand(DatabaseCommand):
     """Команда для создания новой таблицы."""
     
-    def __init__(self, table_name: str, column_specs: List[str]):
+    COMMAND_NAME = "create_table"
+    __slots__ = ("table_name", "column_specs")
+    
+    def __init__(self, table_name: str, column_specs: Sequence[str]):
         self.table_name = table_name
-        self.column_specs = column_specs
+        self.column_specs: Tuple[str, ...] = tuple(column_specs)
     
     def execute(self, db: Database) -> str:
         """Создать таблицу в базе данных."""
@@ -84,27 +256,24 @@ class CreateTableCommand(DatabaseCommand):
     def from_input(cls, args: List[str]) -> "CreateTableCommand":
         """Разобрать аргументы команды create_table."""
         if len(args) < 3:
-            raise InvalidCommandError(
-                "Некорректное значение: недостаточно аргументов. Попробуйте снова."
-            )
+            raise InvalidCommandError(_ERR_CREATE_ARGS)
         
-        command_name = args[0]
-        if command_name.lower() != cls.get_command_name():
-            raise InvalidCommandError(f"Неверное имя команды: {command_name}")
+        # Реестр выбирает класс по имени команды, поэтому проверка
+        # нужна только при отладке и отключается в режиме python -O
+        assert args[0].lower() == cls.COMMAND_NAME
         
         table_name = args[1]
         column_specs = args[2:]
         
         return cls(table_name, column_specs)
-    
-    @classmethod
-    def get_command_name(cls) -> str:
-        return "create_table"
 
 
 class DropTableCommand(DatabaseCommand):
     """Команда для удаления таблицы."""
     
+    COMMAND_NAME = "drop_table"
+    __slots__ = ("table_name",)
+    
     def __init__(self, table_name: str):
         self.table_name = table_name
     
@@ -119,26 +288,20 @@ class DropTableCommand(DatabaseCommand):
     def from_input(cls, args: List[str]) -> "DropTableCommand":
         """Разобрать аргументы команды drop_table."""
         if len(args) != 2:
-            raise InvalidCommandError(
-                "Некорректное значение: неправильное количество аргументов. "
-                "Попробуйте снова."
-            )
+            raise InvalidCommandError(_ERR_DROP_ARGS)
         
-        command_name = args[0]
-        if command_name.lower() != cls.get_command_name():
-            raise InvalidCommandError(f"Неверное имя команды: {command_name}")
+        assert args[0].lower() == cls.COMMAND_NAME
         
         table_name = args[1]
         return cls(table_name)
-    
-    @classmethod
-    def get_command_name(cls) -> str:
-        return "drop_table"
 
 
 class ListTablesCommand(DatabaseCommand):
     """Команда для отображения списка всех таблиц."""
     
+    COMMAND_NAME = "list_tables"
+    __slots__ = ()
+    
     def execute(self, db: Database) -> str:
         """Получить список всех таблиц в базе данных."""
         return db.list_tables()
@@ -147,20 +310,35 @@ class ListTablesCommand(DatabaseCommand):
     def from_input(cls, args: List[str]) -> "ListTablesCommand":
         """Разобрать аргументы команды list_tables."""
         if len(args) != 1:
-            raise InvalidCommandError(
-                "Некорректное значение: команда list_tables не принимает "
-                "аргументов. Попробуйте снова."
-            )
+            raise InvalidCommandError(_ERR_LIST_ARGS)
         
-        command_name = args[0]
-        if command_name.lower() != cls.get_command_name():
-            raise InvalidCommandError(f"Неверное имя команды: {command_name}")
+        assert args[0].lower() == cls.COMMAND_NAME
         
         return cls()
-    
-    @classmethod
-    def get_command_name(cls) -> str:
-        return "list_tables"
+
+
+@functools.lru_cache(maxsize=COMMAND_INTERN_SIZE)
+def _intern_command(
+    command_class: Type[DatabaseCommand], args: Tuple[str, ...]
+) -> DatabaseCommand:
+    """
+    Получить общий экземпляр команды для данного набора аргументов.
+    
+    Команды не изменяются после создания, поэтому повторный ввод одной
+    и той же команды (например, "list_tables" с разными пробелами) может
+    использовать уже созданный экземпляр.
+    
+    Args:
+        command_class: Класс команды
+        args: Аргументы команды (первый элемент - имя команды)
+        
+    Returns:
+        Экземпляр команды
+        
+    Raises:
+        InvalidCommandError: Если ввод некорректен для данной команды
+    """
+    return command_class.from_input(list(args))
 
 
 class DatabaseCommandRegistry:
@@ -168,6 +346,17 @@ class DatabaseCommandRegistry:
     
     def __init__(self):
         self._commands: Dict[str, Type[DatabaseCommand]] = {}
+        # Связанные методы from_raw, заранее полученные при регистрации
+        self._builders: Dict[str, Callable[[str], DatabaseCommand]] = {}
+        # Представление реестра только для чтения, отражает все регистрации
+        self.commands: Mapping[str, Type[DatabaseCommand]] = MappingProxyType(
+            self._commands
+        )
+        # LRU-кеш разобранных команд: нормализованный ввод -> экземпляр команды
+        self._parse_cache: OrderedDict[str, DatabaseCommand] = OrderedDict()
+        # Регулярное выражение для выбора команды по первому слову,
+        # пересобирается при первом разборе после регистрации
+        self._dispatch_re: Optional[re.Pattern] = None
         self._register_default_commands()
     
     def _register_default_commands(self):
@@ -182,9 +371,27 @@ class DatabaseCommandRegistry:
         self.register_command(InfoCommand)
     
     def register_command(self, command_class: Type[DatabaseCommand]):
-        """Зарегистрировать класс команды базы данных."""
-        command_name = command_class.get_command_name()
+        """
+        Зарегистрировать класс команды базы данных.
+        
+        Имя команды приводится к нижнему регистру, как и ввод при разборе,
+        и интернируется, чтобы поиск в реестре сравнивал строки по ссылке.
+        """
+        command_name = sys.intern(command_class.COMMAND_NAME.lower())
         self._commands[command_name] = command_class
+        self._builders[command_name] = command_class.from_raw
+        # Закешированные команды могли быть созданы прежним классом
+        self._parse_cache.clear()
+        self._dispatch_re = None
+    
+    def _get_dispatch_re(self) -> re.Pattern:
+        """Получить регулярное выражение, выделяющее имя команды из ввода."""
+        if self._dispatch_re is None:
+            names = sorted(self._commands, key=len, reverse=True)
+            self._dispatch_re = re.compile(
+                r"(" + "|".join(map(re.escape, names)) + r")(?=\s|$)"
+            )
+        return self._dispatch_re
     
     def is_database_command(self, command_name: str) -> bool:
         """Проверить, является ли имя команды командой базы данных."""
@@ -194,6 +401,10 @@ class DatabaseCommandRegistry:
         """
         Разобрать пользовательский ввод и создать соответствующую команду базы данных.
         
+        Результаты разбора хранятся в LRU-кеше, поэтому повторный ввод той же
+        команды не разбирается заново. Команды не изменяются при выполнении,
+        так что закешированный экземпляр можно выполнять многократно.
+        
         Args:
             user_input: Строка с пользовательским вводом
             
@@ -203,24 +414,35 @@ class DatabaseCommandRegistry:
         Raises:
             InvalidCommandError: Если команда недействительна
         """
-        if not user_input.strip():
-            raise InvalidCommandError("Пустая команда")
-        
-        try:
-            args = shlex.split(user_input)
-        except ValueError:
-            raise InvalidCommandError("Некорректная команда. Попробуйте снова.")
+        key = user_input.strip()
+        if not key:
+            raise InvalidCommandError(_ERR_EMPTY_COMMAND)
         
-        if not args:
-            raise InvalidCommandError("Пустая команда")
+        command = self._parse_cache.get(key)
+        if command is not None:
+            self._parse_cache.move_to_end(key)
+            return command
         
-        command_name = args[0].lower()
+        command = self._parse_uncached(key)
+        self._parse_cache[key] = command
+        if len(self._parse_cache) > PARSE_CACHE_SIZE:
+            self._parse_cache.popitem(last=False)
         
-        if not self.is_database_command(command_name):
+        return command
+    
+    def _parse_uncached(self, user_input: str) -> DatabaseCommand:
+        """Разобрать непустой ввод без крайних пробелов, минуя кеш."""
+        # Имя команды выделяется одним совпадением регулярного выражения,
+        # а разбор остальной строки выполняет сам класс команды. Имена
+        # хранятся в нижнем регистре, поэтому выражение сопоставляется
+        # с вводом в нижнем регистре, а классу передается исходный ввод
+        match = self._get_dispatch_re().match(user_input.lower())
+        if match is None:
+            command_name = user_input.split(None, 1)[0].lower()
             raise InvalidCommandError(f"Неизвестная команда: {command_name}")
         
-        command_class = self._commands[command_name]
-        return command_class.from_input(args)
+        build = self._builders[match.group(1)]
+        return build(user_input)
     
     def get_database_commands(self) -> List[str]:
         """Получить список имён доступных команд базы данных."""
@@ -230,9 +452,12 @@ class DatabaseCommandRegistry:
 class InsertCommand(DatabaseCommand):
     """Команда для вставки записи в таблицу."""
     
-    def __init__(self, table_name: str, values: List[str]):
+    COMMAND_NAME = "insert"
+    __slots__ = ("table_name", "values")
+    
+    def __init__(self, table_name: str, values: Sequence[str]):
         self.table_name = table_name
-        self.values = values
+        self.values: Tuple[str, ...] = tuple(values)
     
     def execute(self, db: Database) -> str:
         """Вставить запись в таблицу."""
@@ -243,33 +468,61 @@ class InsertCommand(DatabaseCommand):
     
     @classmethod
     def from_input(cls, args: List[str]) -> "InsertCommand":
-        """Разобрать команду insert from user input."""
-        # Объединить обратно в строку для парсера
-        command = " ".join(args)
-        
+        """Разобрать команду insert из списка аргументов."""
+        return cls.from_raw(" ".join(args))
+    
+    @classmethod
+    def from_raw(cls, user_input: str) -> "InsertCommand":
+        """Разобрать команду insert из исходной строки ввода."""
         try:
-            table_name, values = parse_insert(command)
+            table_name, values = parse_insert(user_input)
             return cls(table_name, values)
         except ParseError as e:
             raise InvalidCommandError(str(e))
-    
-    @classmethod
-    def get_command_name(cls) -> str:
-        return "insert"
 
 
 class SelectCommand(DatabaseCommand):
     """Команда для выборки записей из таблицы."""
     
+    COMMAND_NAME = "select"
+    __slots__ = ("table_name", "where_column", "where_value", "_schema")
+    
     def __init__(
         self,
         table_name: str,
-        where_column: str = None,
-        where_value: str = None,
+        where_column: Optional[str] = None,
+        where_value: Optional[str] = None,
     ):
         self.table_name = table_name
         self.where_column = where_column
         self.where_value = where_value
+        # Схема, для которой вычислены имена столбцов:
+        # (таблица, версия схемы, имена столбцов)
+        self._schema: Optional[Tuple[Table, int, Tuple[str, ...]]] = None
+    
+    def _get_column_names(self, db: Database) -> Tuple[str, ...]:
+        """
+        Получить имена столбцов таблицы в порядке вывода.
+        
+        Имена пересчитываются, только если таблица была пересоздана
+        или изменилась версия её схемы.
+        
+        Raises:
+            TableNotFoundError: Если таблица не существует
+        """
+        table = db.get_table(self.table_name)
+        
+        schema = self._schema
+        if (
+            schema is not None
+            and schema[0] is table
+            and schema[1] == table.schema_version
+        ):
+            return schema[2]
+        
+        column_names = tuple(col.name for col in table.columns)
+        self._schema = (table, table.schema_version, column_names)
+        return column_names
     
     def execute(self, db: Database) -> str:
         """Выбрать записи из таблицы."""
@@ -281,18 +534,18 @@ class SelectCommand(DatabaseCommand):
             if not records:
                 return f'В таблице "{self.table_name}" нет записей.'
             
-            # Получить таблицу для определения столбцов
-            table = db.get_table(self.table_name)
-            column_names = [col.name for col in table.columns]
+            column_names = self._get_column_names(db)
             
-            # Создать PrettyTable
-            pt = PrettyTable()
-            pt.field_names = column_names
+            # Большие выборки форматируем без PrettyTable
+            if len(records) >= FAST_FORMAT_THRESHOLD:
+                return _format_table_fast(column_names, records)
             
-            # Добавить записи
-            for record in records:
-                row = [record.get(col, "") for col in column_names]
-                pt.add_row(row)
+            pt = _new_pretty_table(column_names)
+            
+            # Собрать все строки заранее и добавить их одним вызовом
+            pt.add_rows(
+                [[record.get(col, "") for col in column_names] for record in records]
+            )
             
             return str(pt)
         except (TableNotFoundError, ValidationError) as e:
@@ -300,24 +553,31 @@ class SelectCommand(DatabaseCommand):
     
     @classmethod
     def from_input(cls, args: List[str]) -> "SelectCommand":
-        """Разобрать команду select from user input."""
-        # Объединить обратно в строку для парсера
-        command = " ".join(args)
-        
+        """Разобрать команду select из списка аргументов."""
+        return cls.from_raw(" ".join(args))
+    
+    @classmethod
+    def from_raw(cls, user_input: str) -> "SelectCommand":
+        """Разобрать команду select из исходной строки ввода."""
         try:
-            table_name, where_column, where_value = parse_select(command)
+            table_name, where_column, where_value = parse_select(user_input)
             return cls(table_name, where_column, where_value)
         except ParseError as e:
             raise InvalidCommandError(str(e))
-    
-    @classmethod
-    def get_command_name(cls) -> str:
-        return "select"
 
 
 class UpdateCommand(DatabaseCommand):
     """Команда для обновления записей в таблице."""
     
+    COMMAND_NAME = "update"
+    __slots__ = (
+        "table_name",
+        "set_column",
+        "set_value",
+        "where_column",
+        "where_value",
+    )
+    
     def __init__(
         self,
         table_name: str,
@@ -351,10 +611,12 @@ class UpdateCommand(DatabaseCommand):
     
     @classmethod
     def from_input(cls, args: List[str]) -> "UpdateCommand":
-        """Разобрать команду update from user input."""
-        # Объединить обратно в строку для парсера
-        command = " ".join(args)
-        
+        """Разобрать команду update из списка аргументов."""
+        return cls.from_raw(" ".join(args))
+    
+    @classmethod
+    def from_raw(cls, user_input: str) -> "UpdateCommand":
+        """Разобрать команду update из исходной строки ввода."""
         try:
             (
                 table_name,
@@ -362,21 +624,20 @@ class UpdateCommand(DatabaseCommand):
                 set_value,
                 where_column,
                 where_value,
-            ) = parse_update(command)
+            ) = parse_update(user_input)
             return cls(
                 table_name, set_column, set_value, where_column, where_value
             )
         except ParseError as e:
             raise InvalidCommandError(str(e))
-    
-    @classmethod
-    def get_command_name(cls) -> str:
-        return "update"
 
 
 class DeleteCommand(DatabaseCommand):
     """Команда для удаления записей из таблицы."""
     
+    COMMAND_NAME = "delete"
+    __slots__ = ("table_name", "where_column", "where_value")
+    
     def __init__(self, table_name: str, where_column: str, where_value: str):
         self.table_name = table_name
         self.where_column = where_column
@@ -395,24 +656,25 @@ class DeleteCommand(DatabaseCommand):
     
     @classmethod
     def from_input(cls, args: List[str]) -> "DeleteCommand":
-        """Разобрать команду delete from user input."""
-        # Объединить обратно в строку для парсера
-        command = " ".join(args)
-        
+        """Разобрать команду delete из списка аргументов."""
+        return cls.from_raw(" ".join(args))
+    
+    @classmethod
+    def from_raw(cls, user_input: str) -> "DeleteCommand":
+        """Разобрать команду delete из исходной строки ввода."""
         try:
-            table_name, where_column, where_value = parse_delete(command)
+            table_name, where_column, where_value = parse_delete(user_input)
             return cls(table_name, where_column, where_value)
         except ParseError as e:
             raise InvalidCommandError(str(e))
-    
-    @classmethod
-    def get_command_name(cls) -> str:
-        return "delete"
 
 
 class InfoCommand(DatabaseCommand):
     """Команда для получения информации о таблице."""
     
+    COMMAND_NAME = "info"
+    __slots__ = ("table_name",)
+    
     def __init__(self, table_name: str):
         self.table_name = table_name
     
@@ -425,16 +687,14 @@ class InfoCommand(DatabaseCommand):
     
     @classmethod
     def from_input(cls, args: List[str]) -> "InfoCommand":
-        """Разобрать команду info from user input."""
-        # Объединить обратно в строку для парсера
-        command = " ".join(args)
-        
+        """Разобрать команду info из списка аргументов."""
+        return cls.from_raw(" ".join(args))
+    
+    @classmethod
+    def from_raw(cls, user_input: str) -> "InfoCommand":
+        """Разобрать команду info из исходной строки ввода."""
         try:
-            table_name = parse_info(command)
+            table_name = parse_info(user_input)
             return cls(table_name)
         except ParseError as e:
             raise InvalidCommandError(str(e))
-    
-    @classmethod
-    def get_command_name(cls) -> str:
-        return "info"
\ No newline at end of file
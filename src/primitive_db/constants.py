@@ -7,4 +7,30 @@ META_FILE = "db_meta.json"
 DATA_DIR = "data"
 
 # Допустимые типы данных для столбцов
-VALID_TYPES = {"int", "str", "bool"}
+VALID_TYPES = frozenset({"int", "str", "bool"})
+
+# Максимальное количество разобранных команд в кеше реестра команд
+PARSE_CACHE_SIZE = 512
+
+# Максимальное количество разделяемых экземпляров команд с одинаковыми
+# аргументами
+COMMAND_INTERN_SIZE = 1024
+
+# Переменная окружения пакетного режима: если она задана, операции
+# не запрашивают подтверждение и не выводят время выполнения
+BATCH_MODE_ENV = "PRIMITIVE_DB_BATCH"
+
+# Максимальное количество результатов select-запросов в кеше
+SELECT_CACHE_SIZE = 128
+
+# Начиная с этого количества записей select форматируется без PrettyTable
+FAST_FORMAT_THRESHOLD = 100
+
+
+# Задержка (в секундах) перед записью изменённых таблиц на диск: изменения,
+# сделанные за это время, сохраняются одной записью файла
+SAVE_DELAY = 0.5
+
+# Журнал таблицы перезаписывается целиком, когда строк в нём становится
+# больше, чем строк таблицы, умноженных на это число
+LOG_COMPACT_RATIO = 2
\ No newline at end of file
@@ -1,40 +1,58 @@
-from typing import Any, Dict, List, Optional
+import atexit
+import threading
+from typing import Any, Callable, Dict, Optional, Sequence, Set, Tuple
 
-from .constants import META_FILE, VALID_TYPES
+from .constants import LOG_COMPACT_RATIO, META_FILE, SAVE_DELAY, VALID_TYPES
 from .decorators import confirm_action, create_cacher, handle_db_errors, log_time
+from .exceptions import (  # noqa: F401 - исключения доступны и из core
+    DatabaseError,
+    RecordNotFoundError,
+    TableExistsError,
+    TableNotFoundError,
+    ValidationError,
+)
 from .models import Column, Table
+from .storage import TableStore
 from .utils import (
+    append_table_rows,
     delete_table_data,
     load_metadata,
-    load_table_data,
+    read_table_log,
     save_metadata,
-    save_table_data,
+    save_table_rows,
 )
 
+# Строковые представления булевых значений
+_BOOL_TRUE = frozenset(("true", "1", "yes"))
+_BOOL_FALSE = frozenset(("false", "0", "no"))
 
-class DatabaseError(Exception):
-    """Базовое исключение для операций базы данных."""
-    pass
-
-
-class TableExistsError(DatabaseError):
-    """Исключение при попытке создать таблицу, которая уже существует."""
-    pass
+# Сообщение при попытке изменить ID записи
+_ERR_ID_READONLY = "Столбец 'ID' нельзя изменить"
 
 
-class TableNotFoundError(DatabaseError):
-    """Исключение при попытке доступа к несуществующей таблице."""
-    pass
+def _parse_str(value: str) -> str:
+    """Вернуть строку без окружающих двойных кавычек, если они есть."""
+    if value[:1] == '"' and value[-1:] == '"':
+        return value[1:-1]
+    return value
 
 
-class ValidationError(DatabaseError):
-    """Исключение при ошибке валидации данных."""
-    pass
+def _parse_bool(value: str) -> bool:
+    """Преобразовать строку в булево значение."""
+    lowered = value.lower()
+    if lowered in _BOOL_TRUE:
+        return True
+    if lowered in _BOOL_FALSE:
+        return False
+    raise ValueError(f"Некорректное булево значение: {value}")
 
 
-class RecordNotFoundError(DatabaseError):
-    """Исключение когда запись не найдена."""
-    pass
+# Преобразователи строковых значений по типу столбца
+_PARSERS: Dict[str, Callable[[str], Any]] = {
+    "int": int,
+    "str": _parse_str,
+    "bool": _parse_bool,
+}
 
 
 class Database:
@@ -49,14 +67,23 @@ class Database:
         """
         self.metadata_file = metadata_file
         self.tables: Dict[str, Table] = {}
+        # Данные таблиц в памяти, загружаются с диска при первом обращении
+        self._data_cache: Dict[str, TableStore] = {}
+        # Таблицы, изменения которых ещё не записаны на диск
+        self._dirty: Set[str] = set()
+        self._save_timer: Optional[threading.Timer] = None
+        self._save_lock = threading.RLock()
         self.load_tables()
+        atexit.register(self.flush)
         # Создаем функцию кеширования для select-запросов
         self._cache_select = create_cacher()
     
     def load_tables(self) -> None:
         """Загрузить таблицы из файла метаданных."""
+        self.flush()
         metadata = load_metadata(self.metadata_file)
         self.tables = {}
+        self._data_cache = {}
         
         for table_name, table_data in metadata.items():
             self.tables[table_name] = Table.from_dict(table_name, table_data)
@@ -69,13 +96,110 @@ class Database:
         
         save_metadata(self.metadata_file, metadata)
     
-    def _clear_select_cache(self) -> None:
-        """Очистить кеш select-запросов при изменении данных."""
-        # Создаем новую функцию кеширования, чтобы очистить старый кеш
-        self._cache_select = create_cacher()
+    def _get_store(self, table_name: str) -> TableStore:
+        """
+        Получить данные таблицы из памяти.
+        
+        При первом обращении данные загружаются с диска и раскладываются
+        по столбцам, после чего операции изменяют это же хранилище
+        и сохраняют его на диск.
+        
+        Args:
+            table_name: Имя таблицы
+            
+        Returns:
+            Хранилище данных таблицы
+        """
+        store = self._data_cache.get(table_name)
+        if store is None:
+            records, log_length = read_table_log(table_name)
+            store = TableStore.from_records(
+                self.tables[table_name].list_columns(), records
+            )
+            store.log_length = log_length
+            self._data_cache[table_name] = store
+        return store
+    
+    def _mark_dirty(self, table_name: str) -> None:
+        """
+        Отметить таблицу как изменённую и отложить её запись на диск.
+        
+        Таймер запускается только первым изменением после сохранения,
+        поэтому серия изменений сохраняется одной записью файла не позже
+        чем через SAVE_DELAY секунд после первого из них, а на каждое
+        изменение не создаётся новый поток.
+        
+        Args:
+            table_name: Имя таблицы
+        """
+        with self._save_lock:
+            self._dirty.add(table_name)
+            if self._save_timer is None:
+                # flush сбрасывает _save_timer, следующее изменение
+                # запустит новый таймер
+                self._save_timer = threading.Timer(SAVE_DELAY, self.flush)
+                self._save_timer.daemon = True
+                self._save_timer.start()
+    
+    def flush(self) -> None:
+        """Записать на диск все изменённые таблицы."""
+        with self._save_lock:
+            if self._save_timer is not None:
+                self._save_timer.cancel()
+                self._save_timer = None
+            
+            for table_name in sorted(self._dirty):
+                store = self._data_cache.get(table_name)
+                if store is not None:
+                    self._save_store(table_name, store)
+                # Таблица остаётся изменённой, если запись не удалась
+                self._dirty.discard(table_name)
+    
+    def _save_store(self, table_name: str, store: TableStore) -> None:
+        """
+        Записать изменения таблицы в её журнал на диске.
+        
+        Обычно изменения дописываются в конец журнала. Когда строк в журнале
+        становится больше LOG_COMPACT_RATIO строк таблицы, журнал
+        перезаписывается только текущими записями.
+        
+        Args:
+            table_name: Имя таблицы
+            store: Данные таблицы
+        """
+        pending = list(store.pending_rows())
+        log_length = store.log_length
+        
+        try:
+            if (
+                log_length is None
+                or log_length + len(pending) > LOG_COMPACT_RATIO * len(store)
+            ):
+                save_table_rows(table_name, store.encoded_rows())
+                store.log_length = len(store)
+            else:
+                append_table_rows(table_name, pending)
+                store.log_length = log_length + len(pending)
+        except OSError:
+            # Журнал мог остаться дописанным частично: следующее сохранение
+            # перезапишет его целиком
+            store.log_length = None
+            raise
+        
+        # Строки убираются из очереди только после успешной записи
+        store.clear_pending(len(pending))
+    
+    def close(self) -> None:
+        """Сохранить отложенные изменения и завершить работу с базой."""
+        self.flush()
+        atexit.unregister(self.flush)
+    
+    def _clear_select_cache(self, table_name: str) -> None:
+        """Очистить кеш select-запросов к изменённой таблице."""
+        self._cache_select.clear_prefix(f"{table_name}:")
     
     @handle_db_errors
-    def create_table(self, table_name: str, column_specs: List[str]) -> str:
+    def create_table(self, table_name: str, column_specs: Sequence[str]) -> str:
         """
         Создать новую таблицу.
         
@@ -118,6 +242,7 @@ class Database:
         
         table = Table(table_name, columns)
         self.tables[table_name] = table
+        self._data_cache.pop(table_name, None)
         
         self.save_tables()
         
@@ -147,7 +272,11 @@ class Database:
         del self.tables[table_name]
         
         # Delete table data file
-        delete_table_data(table_name)
+        with self._save_lock:
+            self._dirty.discard(table_name)
+            delete_table_data(table_name)
+            self._data_cache.pop(table_name, None)
+        self._clear_select_cache(table_name)
         
         # Save to file
         self.save_tables()
@@ -208,48 +337,34 @@ class Database:
         Raises:
             ValidationError: Если значение не соответствует типу
         """
+        parser = _PARSERS.get(expected_type)
+        if parser is None:
+            raise ValidationError(f"Неизвестный тип: {expected_type}")
+        
         try:
-            if expected_type == "int":
-                return int(value)
-            elif expected_type == "str":
-                # Убираем кавычки если есть
-                if value.startswith('"') and value.endswith('"'):
-                    return value[1:-1]
-                return value
-            elif expected_type == "bool":
-                if value.lower() in ("true", "1", "yes"):
-                    return True
-                elif value.lower() in ("false", "0", "no"):
-                    return False
-                else:
-                    raise ValueError(f"Некорректное булево значение: {value}")
-            else:
-                raise ValidationError(f"Неизвестный тип: {expected_type}")
+            return parser(value)
         except (ValueError, TypeError) as e:
             raise ValidationError(
                 f"Не удалось преобразовать '{value}' в тип {expected_type}: {e}"
             )
     
-    @handle_db_errors
-    @log_time
-    def insert(self, table_name: str, values: List[str]) -> str:
+    def _build_record(
+        self, table: Table, values: Sequence[str], record_id: int
+    ) -> Dict[str, Any]:
         """
-        Вставить новую запись в таблицу.
+        Проверить значения и собрать из них запись таблицы.
         
         Args:
-            table_name: Имя таблицы
+            table: Таблица
             values: Список значений (без ID)
+            record_id: ID новой записи
             
         Returns:
-            Сообщение об успехе
+            Запись (словарь)
             
         Raises:
-            TableNotFoundError: Если таблица не существует
             ValidationError: Если данные некорректны
         """
-        # Проверить существование таблицы
-        table = self.get_table(table_name)
-        
         # Проверить количество значений (без ID)
         expected_count = len(table.columns) - 1  # Минус ID
         if len(values) != expected_count:
@@ -257,18 +372,8 @@ class Database:
                 f"Ожидается {expected_count} значений, получено {len(values)}"
             )
         
-        # Загрузить данные таблицы
-        table_data = load_table_data(table_name)
-        
-        # Генерировать новый ID
-        if table_data:
-            max_id = max(record["ID"] for record in table_data)
-            new_id = max_id + 1
-        else:
-            new_id = 1
-        
         # Создать новую запись
-        record = {"ID": new_id}
+        record = {"ID": record_id}
         
         # Валидировать и добавить значения
         for i, value in enumerate(values):
@@ -276,17 +381,114 @@ class Database:
             validated_value = self._validate_value(value, column.type)
             record[column.name] = validated_value
         
-        # Добавить запись
-        table_data.append(record)
+        return record
+    
+    def _typed_value(self, table: Table, column_name: str, value: str) -> Any:
+        """
+        Преобразовать значение к типу столбца таблицы.
         
-        # Сохранить данные
-        save_table_data(table_name, table_data)
+        Args:
+            table: Таблица
+            column_name: Имя столбца
+            value: Строковое значение
+            
+        Returns:
+            Преобразованное значение
+            
+        Raises:
+            ValidationError: Если столбца нет или значение некорректно
+        """
+        try:
+            column = table.get_column(column_name)
+        except ValueError as e:
+            raise ValidationError(str(e))
         
-        # Очистить кеш select-запросов
-        self._clear_select_cache()
+        return self._validate_value(value, column.type)
+    
+    @handle_db_errors
+    @log_time
+    def insert(self, table_name: str, values: Sequence[str]) -> str:
+        """
+        Вставить новую запись в таблицу.
+        
+        Args:
+            table_name: Имя таблицы
+            values: Список значений (без ID)
+            
+        Returns:
+            Сообщение об успехе
+            
+        Raises:
+            TableNotFoundError: Если таблица не существует
+            ValidationError: Если данные некорректны
+        """
+        # Проверить существование таблицы
+        table = self.get_table(table_name)
+        
+        # Загрузить данные таблицы
+        store = self._get_store(table_name)
+        
+        # Генерировать новый ID и создать новую запись
+        new_id = store.max_id + 1
+        record = self._build_record(table, values, new_id)
+        
+        # Добавить запись и отложить сохранение
+        with self._save_lock:
+            store.append(record)
+            self._mark_dirty(table_name)
+        
+        # Очистить кеш select-запросов к этой таблице
+        self._clear_select_cache(table_name)
         
         return f'Запись с ID={new_id} успешно добавлена в таблицу "{table_name}".'
     
+    @handle_db_errors
+    @log_time
+    def insert_many(self, table_name: str, rows: Sequence[Sequence[str]]) -> str:
+        """
+        Вставить несколько записей в таблицу за одну операцию.
+        
+        Все строки проверяются до вставки: если хотя бы одна некорректна,
+        не вставляется ни одна. Сохранение и очистка кеша выполняются
+        один раз на всю пачку.
+        
+        Args:
+            table_name: Имя таблицы
+            rows: Списки значений записей (без ID)
+            
+        Returns:
+            Сообщение об успехе
+            
+        Raises:
+            TableNotFoundError: Если таблица не существует
+            ValidationError: Если данные некорректны
+        """
+        table = self.get_table(table_name)
+        store = self._get_store(table_name)
+        
+        if not rows:
+            raise ValidationError("Нет записей для вставки")
+        
+        # Назначить ID подряд и проверить все записи до вставки
+        first_id = store.max_id + 1
+        records = [
+            self._build_record(table, values, first_id + i)
+            for i, values in enumerate(rows)
+        ]
+        
+        with self._save_lock:
+            for record in records:
+                store.append(record)
+            self._mark_dirty(table_name)
+        
+        self._clear_select_cache(table_name)
+        
+        last_id = first_id + len(records) - 1
+        return (
+            f'{len(records)} записей (ID={first_id}..{last_id}) успешно '
+            f'добавлены в таблицу "{table_name}".'
+        )
+    
     @handle_db_errors
     @log_time
     def select(
@@ -294,17 +496,20 @@ class Database:
         table_name: str,
         where_column: Optional[str] = None,
         where_value: Optional[str] = None,
-    ) -> List[Dict[str, Any]]:
+    ) -> Tuple[Dict[str, Any], ...]:
         """
         Выбрать записи из таблицы.
         
+        Результат кешируется и возвращается повторным запросам как есть,
+        поэтому его нельзя изменять.
+        
         Args:
             table_name: Имя таблицы
             where_column: Столбец для фильтрации (опционально)
             where_value: Значение для фильтрации (опционально)
             
         Returns:
-            Список записей (словарей)
+            Кортеж записей (словарей)
             
         Raises:
             TableNotFoundError: Если таблица не существует
@@ -313,16 +518,16 @@ class Database:
         cache_key = f"{table_name}:{where_column}:{where_value}"
         
         # Функция для выполнения запроса
-        def _execute_select() -> List[Dict[str, Any]]:
+        def _execute_select() -> Tuple[Dict[str, Any], ...]:
             # Проверить существование таблицы
             table = self.get_table(table_name)
             
             # Загрузить данные таблицы
-            table_data = load_table_data(table_name)
+            store = self._get_store(table_name)
             
             # Если нет условия where, вернуть все записи
             if where_column is None or where_value is None:
-                return table_data
+                return tuple(store.rows())
             
             # Проверить что столбец существует
             try:
@@ -333,14 +538,8 @@ class Database:
             # Преобразовать значение where в нужный тип
             typed_value = self._validate_value(where_value, column.type)
             
-            # Фильтровать записи
-            filtered = [
-                record
-                for record in table_data
-                if record.get(where_column) == typed_value
-            ]
-            
-            return filtered
+            # Найти строки по хеш-индексу столбца
+            return tuple(store.rows(store.find(where_column, typed_value)))
         
         # Использовать кеширование
         return self._cache_select(cache_key, _execute_select)
@@ -375,6 +574,10 @@ class Database:
         # Проверить существование таблицы
         table = self.get_table(table_name)
         
+        # ID определяет запись в журнале таблицы и не меняется
+        if set_column == "ID":
+            raise ValidationError(_ERR_ID_READONLY)
+        
         # Проверить что столбцы существуют
         try:
             set_col = table.get_column(set_column)
@@ -383,32 +586,30 @@ class Database:
             raise ValidationError(str(e))
         
         # Загрузить данные таблицы
-        table_data = load_table_data(table_name)
+        store = self._get_store(table_name)
         
         # Преобразовать значения
         typed_where_value = self._validate_value(where_value, where_col.type)
         typed_set_value = self._validate_value(set_value, set_col.type)
         
-        # Найти и обновить записи
-        updated_count = 0
-        updated_ids = []
-        
-        for record in table_data:
-            if record.get(where_column) == typed_where_value:
-                record[set_column] = typed_set_value
-                updated_count += 1
-                updated_ids.append(record["ID"])
+        # Найти строки по индексу и обновить значение столбца
+        positions = store.find(where_column, typed_where_value)
+        ids = store.columns["ID"]
+        updated_ids = [ids[position] for position in positions]
+        updated_count = len(updated_ids)
+        with self._save_lock:
+            store.update(positions, set_column, typed_set_value)
         
         if updated_count == 0:
             raise RecordNotFoundError(
                 f"Записи с условием {where_column}={where_value} не найдены"
             )
         
-        # Сохранить данные
-        save_table_data(table_name, table_data)
+        # Отложить сохранение данных
+        self._mark_dirty(table_name)
         
-        # Очистить кеш select-запросов
-        self._clear_select_cache()
+        # Очистить кеш select-запросов к этой таблице
+        self._clear_select_cache(table_name)
         
         ids_str = ", ".join([f"ID={id}" for id in updated_ids])
         if updated_count == 1:
@@ -419,6 +620,66 @@ class Database:
                 f'успешно обновлены.'
             )
     
+    @handle_db_errors
+    def update_many(
+        self, table_name: str, updates: Sequence[Tuple[str, str, str, str]]
+    ) -> str:
+        """
+        Выполнить несколько обновлений таблицы за одну операцию.
+        
+        Обновления применяются по порядку, как последовательные вызовы
+        update, но все значения проверяются заранее, а сохранение и
+        очистка кеша выполняются один раз.
+        
+        Args:
+            table_name: Имя таблицы
+            updates: Кортежи (set_column, set_value, where_column, where_value)
+            
+        Returns:
+            Сообщение об успехе
+            
+        Raises:
+            TableNotFoundError: Если таблица не существует
+            ValidationError: Если данные некорректны
+            RecordNotFoundError: Если ни одно условие не нашло записей
+        """
+        table = self.get_table(table_name)
+        store = self._get_store(table_name)
+        
+        if any(update[0] == "ID" for update in updates):
+            raise ValidationError(_ERR_ID_READONLY)
+        
+        # Проверить и преобразовать все значения до изменений
+        typed_updates = [
+            (
+                set_column,
+                self._typed_value(table, set_column, set_value),
+                where_column,
+                self._typed_value(table, where_column, where_value),
+            )
+            for set_column, set_value, where_column, where_value in updates
+        ]
+        
+        updated_ids: Set[int] = set()
+        ids = store.columns["ID"]
+        with self._save_lock:
+            for set_column, set_value, where_column, where_value in typed_updates:
+                positions = store.find(where_column, where_value)
+                updated_ids.update([ids[position] for position in positions])
+                store.update(positions, set_column, set_value)
+        
+        if not updated_ids:
+            raise RecordNotFoundError("Записи по указанным условиям не найдены")
+        
+        self._mark_dirty(table_name)
+        self._clear_select_cache(table_name)
+        
+        ids_str = ", ".join([f"ID={id}" for id in sorted(updated_ids)])
+        return (
+            f'{len(updated_ids)} записей ({ids_str}) в таблице "{table_name}" '
+            f'успешно обновлены.'
+        )
+    
     @handle_db_errors
     @confirm_action("удаление записей")
     def delete(
@@ -450,37 +711,29 @@ class Database:
             raise ValidationError(str(e))
         
         # Загрузить данные таблицы
-        table_data = load_table_data(table_name)
+        store = self._get_store(table_name)
         
         # Преобразовать значение
         typed_value = self._validate_value(where_value, column.type)
         
-        # Найти записи для удаления
-        to_delete = [
-            record
-            for record in table_data
-            if record.get(where_column) == typed_value
-        ]
+        # Найти записи для удаления по индексу
+        to_delete = store.find(where_column, typed_value)
         
         if not to_delete:
             raise RecordNotFoundError(
                 f"Записи с условием {where_column}={where_value} не найдены"
             )
         
-        deleted_ids = [record["ID"] for record in to_delete]
-        
-        # Удалить записи
-        table_data = [
-            record
-            for record in table_data
-            if record.get(where_column) != typed_value
-        ]
+        ids = store.columns["ID"]
+        deleted_ids = [ids[position] for position in to_delete]
         
-        # Сохранить данные
-        save_table_data(table_name, table_data)
+        # Удалить строки из всех столбцов в памяти и отложить сохранение
+        with self._save_lock:
+            store.delete(to_delete)
+            self._mark_dirty(table_name)
         
-        # Очистить кеш select-запросов
-        self._clear_select_cache()
+        # Очистить кеш select-запросов к этой таблице
+        self._clear_select_cache(table_name)
         
         ids_str = ", ".join([f"ID={id}" for id in deleted_ids])
         if len(deleted_ids) == 1:
@@ -491,6 +744,61 @@ class Database:
                 f'из таблицы "{table_name}".'
             )
     
+    @handle_db_errors
+    @confirm_action("удаление записей")
+    def delete_many(
+        self, table_name: str, conditions: Sequence[Tuple[str, str]]
+    ) -> str:
+        """
+        Удалить записи, подходящие под любое из условий, за одну операцию.
+        
+        Подтверждение запрашивается один раз, строки удаляются одним
+        проходом по столбцам, сохранение и очистка кеша - один раз.
+        
+        Args:
+            table_name: Имя таблицы
+            conditions: Кортежи (where_column, where_value)
+            
+        Returns:
+            Сообщение об успехе
+            
+        Raises:
+            TableNotFoundError: Если таблица не существует
+            ValidationError: Если данные некорректны
+            RecordNotFoundError: Если записи не найдены
+        """
+        table = self.get_table(table_name)
+        store = self._get_store(table_name)
+        
+        typed_conditions = [
+            (where_column, self._typed_value(table, where_column, where_value))
+            for where_column, where_value in conditions
+        ]
+        
+        to_delete = sorted({
+            position
+            for where_column, where_value in typed_conditions
+            for position in store.find(where_column, where_value)
+        })
+        
+        if not to_delete:
+            raise RecordNotFoundError("Записи по указанным условиям не найдены")
+        
+        ids = store.columns["ID"]
+        deleted_ids = [ids[position] for position in to_delete]
+        
+        with self._save_lock:
+            store.delete(to_delete)
+            self._mark_dirty(table_name)
+        
+        self._clear_select_cache(table_name)
+        
+        ids_str = ", ".join([f"ID={id}" for id in deleted_ids])
+        return (
+            f'{len(deleted_ids)} записей ({ids_str}) успешно удалены '
+            f'из таблицы "{table_name}".'
+        )
+    
     @handle_db_errors
     def get_table_info(self, table_name: str) -> str:
         """
@@ -506,10 +814,10 @@ class Database:
             TableNotFoundError: Если таблица не существует
         """
         table = self.get_table(table_name)
-        table_data = load_table_data(table_name)
+        store = self._get_store(table_name)
         
         columns_str = ", ".join([f"{col.name}:{col.type}" for col in table.columns])
-        record_count = len(table_data)
+        record_count = len(store)
         
         return (
             f"Таблица: {table_name}\n"
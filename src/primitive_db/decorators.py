@@ -1,11 +1,22 @@
 """Декораторы для улучшения функциональности базы данных."""
 
+import os
 import time
+from collections import OrderedDict
 from functools import wraps
-from typing import Any, Callable
+from typing import Any, Callable, Optional
 
 import prompt
 
+from .constants import BATCH_MODE_ENV, SELECT_CACHE_SIZE
+from .exceptions import (
+    DatabaseError,
+    RecordNotFoundError,
+    TableExistsError,
+    TableNotFoundError,
+    ValidationError,
+)
+
 
 def handle_db_errors(func: Callable) -> Callable:
     """
@@ -22,15 +33,6 @@ def handle_db_errors(func: Callable) -> Callable:
     """
     @wraps(func)
     def wrapper(*args: Any, **kwargs: Any) -> Any:
-        # Import at runtime to avoid circular import
-        from .core import (
-            DatabaseError,
-            RecordNotFoundError,
-            TableExistsError,
-            TableNotFoundError,
-            ValidationError,
-        )
-        
         try:
             return func(*args, **kwargs)
         except FileNotFoundError as e:
@@ -58,10 +60,18 @@ def handle_db_errors(func: Callable) -> Callable:
     return wrapper
 
 
+def _batch_mode() -> bool:
+    """Проверить, запущена ли база в пакетном (неинтерактивном) режиме."""
+    return bool(os.environ.get(BATCH_MODE_ENV))
+
+
 def confirm_action(action_name: str) -> Callable:
     """
     Фабрика декораторов для запроса подтверждения опасных операций.
     
+    В пакетном режиме (задана переменная окружения BATCH_MODE_ENV)
+    подтверждение не запрашивается и функция возвращается как есть.
+    
     Args:
         action_name: Название действия для отображения в запросе
         
@@ -75,6 +85,9 @@ def confirm_action(action_name: str) -> Callable:
             pass
     """
     def decorator(func: Callable) -> Callable:
+        if _batch_mode():
+            return func
+        
         @wraps(func)
         def wrapper(*args: Any, **kwargs: Any) -> Any:
             # Запросить подтверждение
@@ -98,6 +111,7 @@ def log_time(func: Callable) -> Callable:
     
     Измеряет и выводит время выполнения функции в консоль.
     Использует time.monotonic() для точного измерения.
+    В пакетном режиме функция возвращается без обёртки.
     
     Args:
         func: Функция для декорирования
@@ -105,6 +119,9 @@ def log_time(func: Callable) -> Callable:
     Returns:
         Обёрнутая функция с замером времени
     """
+    if _batch_mode():
+        return func
+    
     @wraps(func)
     def wrapper(*args: Any, **kwargs: Any) -> Any:
         start_time = time.monotonic()
@@ -119,14 +136,18 @@ def log_time(func: Callable) -> Callable:
     return wrapper
 
 
-def create_cacher() -> Callable:
+def create_cacher(maxsize: int = SELECT_CACHE_SIZE) -> Callable:
     """
     Создаёт функцию кэширования с замыканием.
     
     Возвращает функцию cache_result, которая хранит кэш
     в своём замыкании и использует его для оптимизации
-    повторяющихся запросов.
+    повторяющихся запросов. Кэш хранит не более maxsize
+    результатов и вытесняет давно не использованные.
     
+    Args:
+        maxsize: Максимальное количество результатов в кэше
+        
     Returns:
         Функция cache_result(key, value_func)
         
@@ -134,7 +155,7 @@ def create_cacher() -> Callable:
         cache = create_cacher()
         result = cache("users_all", lambda: db.select("users"))
     """
-    cache = {}
+    cache: OrderedDict = OrderedDict()
     
     def cache_result(key: str, value_func: Callable) -> Any:
         """
@@ -149,14 +170,17 @@ def create_cacher() -> Callable:
         """
         if key in cache:
             print(f"[CACHE HIT] Используется кэшированный результат для '{key}'")
+            cache.move_to_end(key)
             return cache[key]
         
         print(f"[CACHE MISS] Вычисляется результат для '{key}'")
         result = value_func()
         cache[key] = result
+        if len(cache) > maxsize:
+            cache.popitem(last=False)
         return result
     
-    def clear_cache(key: str = None) -> None:
+    def clear_cache(key: Optional[str] = None) -> None:
         """
         Очистить кэш полностью или для определённого ключа.
         
@@ -170,7 +194,18 @@ def create_cacher() -> Callable:
             del cache[key]
             print(f"[CACHE] Очищен кэш для '{key}'")
     
-    # Добавляем метод для очистки кэша
+    def clear_prefix(prefix: str) -> None:
+        """
+        Очистить кэш для всех ключей, начинающихся с префикса.
+        
+        Args:
+            prefix: Префикс ключей для очистки
+        """
+        for key in [key for key in cache if key.startswith(prefix)]:
+            del cache[key]
+    
+    # Добавляем методы для очистки кэша
     cache_result.clear = clear_cache
+    cache_result.clear_prefix = clear_prefix
     
     return cache_result
@@ -1,44 +1,40 @@
-import shlex
-
-import prompt
+import sys
+from typing import Callable, Dict
 
 from .commands import DatabaseCommandRegistry, InvalidCommandError
 from .core import Database
 
+_PROMPT = "\n>>>Введите команду: "
+
+# Welcome text is written in one call instead of a print per line
+_WELCOME_MESSAGE = (
+    "\n***База данных***\n"
+    "\n***Операции с данными***\n"
+    "\nФункции:\n"
+    "<command> insert into <имя_таблицы> values (<значение1>, <значение2>, ...) "
+    "- создать запись\n"
+    "<command> select from <имя_таблицы> where <столбец> = <значение> "
+    "- прочитать записи по условию\n"
+    "<command> select from <имя_таблицы> - прочитать все записи\n"
+    "<command> update <имя_таблицы> set <столбец> = <новое_значение> "
+    "where <столбец> = <значение> - обновить запись\n"
+    "<command> delete from <имя_таблицы> where <столбец> = <значение> "
+    "- удалить запись\n"
+    "<command> info <имя_таблицы> - вывести информацию о таблице\n"
+    "\nУправление таблицами:\n"
+    "<command> create_table <имя_таблицы> <столбец1:тип> <столбец2:тип> .. "
+    "- создать таблицу\n"
+    "<command> list_tables - показать список всех таблиц\n"
+    "<command> drop_table <имя_таблицы> - удалить таблицу\n"
+    "\nОбщие команды:\n"
+    "<command> exit - выход из программы\n"
+    "<command> help - справочная информация\n\n"
+)
+
 
 def print_welcome():
     """Prints the welcome message with all available commands."""
-    print("\n***База данных***")
-    print("\n***Операции с данными***")
-    print("\nФункции:")
-    print(
-        "<command> insert into <имя_таблицы> values (<значение1>, <значение2>, ...) "
-        "- создать запись"
-    )
-    print(
-        "<command> select from <имя_таблицы> where <столбец> = <значение> "
-        "- прочитать записи по условию"
-    )
-    print("<command> select from <имя_таблицы> - прочитать все записи")
-    print(
-        "<command> update <имя_таблицы> set <столбец> = <новое_значение> "
-        "where <столбец> = <значение> - обновить запись"
-    )
-    print(
-        "<command> delete from <имя_таблицы> where <столбец> = <значение> "
-        "- удалить запись"
-    )
-    print("<command> info <имя_таблицы> - вывести информацию о таблице")
-    print("\nУправление таблицами:")
-    print(
-        "<command> create_table <имя_таблицы> <столбец1:тип> <столбец2:тип> .. "
-        "- создать таблицу"
-    )
-    print("<command> list_tables - показать список всех таблиц")
-    print("<command> drop_table <имя_таблицы> - удалить таблицу")
-    print("\nОбщие команды:")
-    print("<command> exit - выход из программы")
-    print("<command> help - справочная информация\n")
+    sys.stdout.write(_WELCOME_MESSAGE)
 
 
 def print_help():
@@ -46,6 +42,34 @@ def print_help():
     print_welcome()
 
 
+def _handle_exit(
+    user_input: str, db: Database, command_registry: DatabaseCommandRegistry
+) -> bool:
+    """Handles the exit command: stops the main loop."""
+    return False
+
+
+def _handle_help(
+    user_input: str, db: Database, command_registry: DatabaseCommandRegistry
+) -> bool:
+    """Handles the help command."""
+    print_help()
+    return True
+
+
+def _handle_db_command(
+    user_input: str, db: Database, command_registry: DatabaseCommandRegistry
+) -> bool:
+    """Parses and executes a DB command using Command Pattern."""
+    try:
+        command = command_registry.parse_command(user_input)
+        result = command.execute(db)
+        print(result)
+    except InvalidCommandError as e:
+        print(str(e))
+    return True
+
+
 def run():
     """Main function that runs the database engine."""
     print_welcome()
@@ -53,35 +77,34 @@ def run():
     db = Database()
     command_registry = DatabaseCommandRegistry()
     
+    # Handler per command name; returns False to stop the loop.
+    # Non-DB commands take precedence over DB commands with the same name
+    handlers: Dict[str, Callable[..., bool]] = dict.fromkeys(
+        command_registry.commands, _handle_db_command
+    )
+    handlers["exit"] = _handle_exit
+    handlers["help"] = _handle_help
+    
     while True:
-        user_input = prompt.string("\n>>>Введите команду: ")
-        
-        if not user_input.strip():
-            continue
-            
+        # Plain input(): empty lines are skipped below, so the prompt
+        # package's re-asking on empty input is not needed here
         try:
-            args = shlex.split(user_input)
-        except ValueError:
-            print("Некорректная команда. Попробуйте снова.")
-            continue
-            
-        if not args:
+            user_input = input(_PROMPT)
+        except EOFError:
+            break
+        
+        # The first word is enough to pick a handler; quote-aware
+        # parsing is left to the commands themselves
+        parts = user_input.split(None, 1)
+        if not parts:
             continue
             
-        command_name = args[0].lower()
+        command_name = parts[0].lower()
         
-        # Handle non-DB commands directly
-        if command_name == "exit":
-            break
-        elif command_name == "help":
-            print_help()
-        # Handle DB commands using Command Pattern
-        elif command_registry.is_database_command(command_name):
-            try:
-                command = command_registry.parse_command(user_input)
-                result = command.execute(db)
-                print(result)
-            except InvalidCommandError as e:
-                print(str(e))
-        else:
+        handler = handlers.get(command_name)
+        if handler is None:
             print(f"Функции {command_name} нет. Попробуйте снова.")
+        elif not handler(user_input, db, command_registry):
+            break
+    
+    db.close()
@@ -0,0 +1,26 @@
+"""Исключения базы данных."""
+
+
+class DatabaseError(Exception):
+    """Базовое исключение для операций базы данных."""
+    pass
+
+
+class TableExistsError(DatabaseError):
+    """Исключение при попытке создать таблицу, которая уже существует."""
+    pass
+
+
+class TableNotFoundError(DatabaseError):
+    """Исключение при попытке доступа к несуществующей таблице."""
+    pass
+
+
+class ValidationError(DatabaseError):
+    """Исключение при ошибке валидации данных."""
+    pass
+
+
+class RecordNotFoundError(DatabaseError):
+    """Исключение когда запись не найдена."""
+    pass
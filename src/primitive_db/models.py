@@ -1,20 +1,52 @@
-from dataclasses import dataclass
-from typing import Any, Dict, List
+import sys
+from typing import Any, Dict, List, Optional, Tuple
 
 from .constants import VALID_TYPES
 
+# Пул столбцов: одинаковые (имя, тип) разделяют один объект Column
+_COLUMN_POOL: Dict[Tuple[str, str], "Column"] = {}
+
 
-@dataclass
 class Column:
     """Представляет столбец базы данных."""
     
+    __slots__ = ("name", "type")
+    
     name: str
     type: str
     
-    def __post_init__(self):
-        """Проверить тип столбца после инициализации."""
-        if self.type not in VALID_TYPES:
-            raise ValueError(f"Недопустимый тип столбца: {self.type}")
+    def __new__(cls, name: str, type: str) -> "Column":
+        """
+        Вернуть столбец из пула или создать, проверить и добавить новый.
+        
+        Args:
+            name: Имя столбца
+            type: Тип столбца ('int', 'str', 'bool')
+            
+        Raises:
+            ValueError: Если тип столбца недопустим
+        """
+        column = _COLUMN_POOL.get((name, type))
+        if column is not None:
+            return column
+        
+        if type not in VALID_TYPES:
+            raise ValueError(f"Недопустимый тип столбца: {type}")
+        
+        column = super().__new__(cls)
+        # Интернированное имя сравнивается с ключами записей по указателю
+        column.name = sys.intern(name)
+        column.type = type
+        _COLUMN_POOL[(column.name, type)] = column
+        return column
+    
+    def __repr__(self) -> str:
+        """Отладочное представление столбца."""
+        return f"Column(name={self.name!r}, type={self.type!r})"
+    
+    def __reduce__(self) -> Tuple[type, Tuple[str, str]]:
+        """Копирование и pickle возвращают столбец через пул."""
+        return (Column, (self.name, self.type))
     
     def to_dict(self) -> Dict[str, str]:
         """Преобразовать столбец в словарное представление."""
@@ -24,7 +56,7 @@ class Column:
 class Table:
     """Представляет таблицу базы данных."""
     
-    def __init__(self, name: str, columns: List[Column] = None):
+    def __init__(self, name: str, columns: Optional[List[Column]] = None) -> None:
         """
         Инициализировать таблицу.
         
@@ -34,6 +66,8 @@ class Table:
         """
         self.name = name
         self.columns: List[Column] = []
+        # Увеличивается при каждом изменении набора столбцов
+        self.schema_version = 0
         
         # Всегда добавляем столбец ID как первый столбец
         self.columns.append(Column("ID", "int"))
@@ -41,32 +75,49 @@ class Table:
         # Добавляем пользовательские столбцы
         if columns:
             self.columns.extend(columns)
+        
+        # Столбцы по имени для поиска за O(1)
+        self._columns_by_name: Dict[str, Column] = {
+            col.name: col for col in self.columns
+        }
+        # Результат to_dict, сбрасывается при изменении столбцов
+        self._dict_cache: Optional[Dict[str, Any]] = None
     
     def add_column(self, column: Column) -> None:
         """Добавить столбец в таблицу."""
         # Проверяем, существует ли столбец уже
-        if any(col.name == column.name for col in self.columns):
+        if column.name in self._columns_by_name:
             raise ValueError(f"Столбец '{column.name}' уже существует")
         
         self.columns.append(column)
+        self._columns_by_name[column.name] = column
+        self._dict_cache = None
+        self.schema_version += 1
     
     def get_column(self, name: str) -> Column:
         """Получить столбец по имени."""
-        for column in self.columns:
-            if column.name == name:
-                return column
-        raise ValueError(f"Столбец '{name}' не найден")
+        column = self._columns_by_name.get(name)
+        if column is None:
+            raise ValueError(f"Столбец '{name}' не найден")
+        return column
     
     def list_columns(self) -> List[str]:
         """Получить список имён столбцов."""
         return [col.name for col in self.columns]
     
     def to_dict(self) -> Dict[str, Any]:
-        """Преобразовать таблицу в словарное представление для JSON сериализации."""
-        return {
-            "name": self.name,
-            "columns": {col.name: col.type for col in self.columns}
-        }
+        """
+        Преобразовать таблицу в словарное представление для JSON сериализации.
+        
+        Словарь строится один раз и переиспользуется до изменения столбцов,
+        поэтому его нельзя изменять.
+        """
+        if self._dict_cache is None:
+            self._dict_cache = {
+                "name": self.name,
+                "columns": {col.name: col.type for col in self.columns}
+            }
+        return self._dict_cache
     
     @classmethod
     def from_dict(cls, name: str, data: Dict[str, Any]) -> "Table":
@@ -74,11 +125,14 @@ class Table:
         table = cls.__new__(cls)  # Создать экземпляр без вызова __init__
         table.name = name
         table.columns = []
+        table.schema_version = 0
         
         # Преобразовать словарь столбцов обратно в объекты Column
         for col_name, col_type in data["columns"].items():
             table.columns.append(Column(col_name, col_type))
         
+        table._columns_by_name = {col.name: col for col in table.columns}
+        table._dict_cache = None
         return table
     
     def __str__(self) -> str:
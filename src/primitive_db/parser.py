@@ -1,15 +1,110 @@
 """Парсер для SQL-подобных команд."""
 
 import re
-import shlex
 from typing import List, Optional, Tuple
 
 
+def _keyword(word: str) -> str:
+    """
+    Шаблон ключевого слова без учета регистра.
+    
+    Классы вида [sS] заменяют флаг re.IGNORECASE, с которым без учета
+    регистра сравнивался бы каждый символ команды, а не только ключевые
+    слова.
+    """
+    return "".join(f"[{char}{char.upper()}]" for char in word)
+
+
+_INSERT, _INTO, _VALUES = _keyword("insert"), _keyword("into"), _keyword("values")
+_SELECT, _FROM, _WHERE = _keyword("select"), _keyword("from"), _keyword("where")
+_UPDATE, _SET = _keyword("update"), _keyword("set")
+_DELETE, _INFO = _keyword("delete"), _keyword("info")
+
+# Выражения отдельных команд для функций parse_*
+_INSERT_RE = re.compile(rf'{_INSERT}\s+{_INTO}\s+(\w+)\s+{_VALUES}\s*\((.*)\)')
+# Условие WHERE необязательно: одно сопоставление для обеих форм SELECT
+_SELECT_RE = re.compile(
+    rf'{_SELECT}\s+{_FROM}\s+(\w+)(?:\s+{_WHERE}\s+(\w+)\s*=\s*(.+))?'
+)
+_UPDATE_RE = re.compile(
+    rf'{_UPDATE}\s+(\w+)\s+{_SET}\s+(\w+)\s*=\s*(.+?)\s+{_WHERE}\s+(\w+)\s*=\s*(.+)'
+)
+_DELETE_RE = re.compile(rf'{_DELETE}\s+{_FROM}\s+(\w+)\s+{_WHERE}\s+(\w+)\s*=\s*(.+)')
+_INFO_RE = re.compile(rf'{_INFO}\s+(\w+)')
+
+
+# Лексемы списка значений INSERT: строка в кавычках, запятая, участок
+# без кавычек и запятых или незакрытая кавычка
+_VALUE_TOKEN_RE = re.compile(
+    r'"(?P<double>[^"]*)"'
+    r"|'(?P<single>[^']*)'"
+    r"|(?P<comma>,)"
+    r"|(?P<bare>[^,\"']+)"
+    r"|(?P<unclosed>[\"'])"
+)
+
+# Строка в кавычках или незакрытая кавычка (группа 1)
+_QUOTE_RE = re.compile(r'"[^"]*"|\'[^\']*\'|(["\'])')
+
+_ERR_UNCLOSED_QUOTE = "Некорректная команда. Попробуйте снова."
+
+
 class ParseError(Exception):
     """Исключение при ошибке парсинга команды."""
     pass
 
 
+def _unquote(value: str) -> str:
+    """Убрать парные двойные или одинарные кавычки вокруг значения."""
+    if len(value) >= 2 and value[0] == value[-1] and value[0] in "\"'":
+        return value[1:-1]
+    return value
+
+
+def _check_quotes(command: str) -> None:
+    """
+    Проверить, что все кавычки в команде закрыты.
+    
+    Raises:
+        ParseError: Если в команде есть незакрытая кавычка
+    """
+    for match in _QUOTE_RE.finditer(command):
+        if match.group(1) is not None:
+            raise ParseError(_ERR_UNCLOSED_QUOTE)
+
+
+def _split_values(values_str: str) -> List[str]:
+    """
+    Разбить список значений команды INSERT по запятым с учетом кавычек.
+    
+    Строка просматривается один раз: части в двойных или одинарных
+    кавычках берутся как есть (без кавычек, запятые внутри не разделяют
+    значения), пробелы вокруг значений вне кавычек отбрасываются.
+    
+    Raises:
+        ParseError: Если кавычки в значениях не сбалансированы
+    """
+    if not values_str.strip():
+        return []
+    
+    values = []
+    parts: List[str] = []
+    for match in _VALUE_TOKEN_RE.finditer(values_str):
+        kind = match.lastgroup
+        if kind == "comma":
+            values.append("".join(parts))
+            parts = []
+        elif kind == "bare":
+            parts.append(match.group("bare").strip())
+        elif kind == "unclosed":
+            raise ParseError("Ошибка парсинга значений: No closing quotation")
+        else:
+            parts.append(match.group(kind))
+    values.append("".join(parts))
+    
+    return values
+
+
 def parse_insert(command: str) -> Tuple[str, List[str]]:
     """
     Парсинг команды INSERT INTO.
@@ -26,8 +121,7 @@ def parse_insert(command: str) -> Tuple[str, List[str]]:
         ParseError: Если формат команды некорректен
     """
     # Паттерн: insert into <table> values (...)
-    pattern = r'insert\s+into\s+(\w+)\s+values\s*\((.*)\)'
-    match = re.match(pattern, command, re.IGNORECASE)
+    match = _INSERT_RE.match(command)
     
     if not match:
         raise ParseError(
@@ -39,10 +133,7 @@ def parse_insert(command: str) -> Tuple[str, List[str]]:
     values_str = match.group(2)
     
     # Парсинг значений с учетом кавычек
-    try:
-        values = shlex.split(values_str.replace(',', ' '))
-    except ValueError as e:
-        raise ParseError(f"Ошибка парсинга значений: {e}")
+    values = _split_values(values_str)
     
     if not values:
         raise ParseError("Не указаны значения для вставки")
@@ -67,35 +158,26 @@ def parse_select(command: str) -> Tuple[str, Optional[str], Optional[str]]:
     Raises:
         ParseError: Если формат команды некорректен
     """
-    # Паттерн с WHERE
-    pattern_with_where = (
-        r'select\s+from\s+(\w+)\s+where\s+(\w+)\s*=\s*(.+)'
-    )
-    match = re.match(pattern_with_where, command, re.IGNORECASE)
+    _check_quotes(command)
     
-    if match:
-        table_name = match.group(1)
-        where_column = match.group(2)
-        where_value = match.group(3).strip()
-        
-        # Убрать кавычки если есть
-        if where_value.startswith('"') and where_value.endswith('"'):
-            where_value = where_value[1:-1]
-        
-        return table_name, where_column, where_value
+    match = _SELECT_RE.match(command)
     
-    # Паттерн без WHERE
-    pattern_no_where = r'select\s+from\s+(\w+)'
-    match = re.match(pattern_no_where, command, re.IGNORECASE)
+    if not match:
+        raise ParseError(
+            "Некорректный формат команды SELECT. "
+            "Используйте: select from <таблица> [where <столбец> = <значение>]"
+        )
+    
+    table_name = match.group(1)
+    where_column = match.group(2)
     
-    if match:
-        table_name = match.group(1)
+    # Паттерн без WHERE
+    if where_column is None:
         return table_name, None, None
     
-    raise ParseError(
-        "Некорректный формат команды SELECT. "
-        "Используйте: select from <таблица> [where <столбец> = <значение>]"
-    )
+    where_value = _unquote(match.group(3).strip())
+    
+    return table_name, where_column, where_value
 
 
 def parse_update(command: str) -> Tuple[str, str, str, str, str]:
@@ -113,10 +195,9 @@ def parse_update(command: str) -> Tuple[str, str, str, str, str]:
     Raises:
         ParseError: Если формат команды некорректен
     """
-    pattern = (
-        r'update\s+(\w+)\s+set\s+(\w+)\s*=\s*(.+?)\s+where\s+(\w+)\s*=\s*(.+)'
-    )
-    match = re.match(pattern, command, re.IGNORECASE)
+    _check_quotes(command)
+    
+    match = _UPDATE_RE.match(command)
     
     if not match:
         raise ParseError(
@@ -127,15 +208,9 @@ def parse_update(command: str) -> Tuple[str, str, str, str, str]:
     
     table_name = match.group(1)
     set_column = match.group(2)
-    set_value = match.group(3).strip()
+    set_value = _unquote(match.group(3).strip())
     where_column = match.group(4)
-    where_value = match.group(5).strip()
-    
-    # Убрать кавычки если есть
-    if set_value.startswith('"') and set_value.endswith('"'):
-        set_value = set_value[1:-1]
-    if where_value.startswith('"') and where_value.endswith('"'):
-        where_value = where_value[1:-1]
+    where_value = _unquote(match.group(5).strip())
     
     return table_name, set_column, set_value, where_column, where_value
 
@@ -155,8 +230,9 @@ def parse_delete(command: str) -> Tuple[str, str, str]:
     Raises:
         ParseError: Если формат команды некорректен
     """
-    pattern = r'delete\s+from\s+(\w+)\s+where\s+(\w+)\s*=\s*(.+)'
-    match = re.match(pattern, command, re.IGNORECASE)
+    _check_quotes(command)
+    
+    match = _DELETE_RE.match(command)
     
     if not match:
         raise ParseError(
@@ -166,11 +242,7 @@ def parse_delete(command: str) -> Tuple[str, str, str]:
     
     table_name = match.group(1)
     where_column = match.group(2)
-    where_value = match.group(3).strip()
-    
-    # Убрать кавычки если есть
-    if where_value.startswith('"') and where_value.endswith('"'):
-        where_value = where_value[1:-1]
+    where_value = _unquote(match.group(3).strip())
     
     return table_name, where_column, where_value
 
@@ -190,8 +262,7 @@ def parse_info(command: str) -> str:
     Raises:
         ParseError: Если формат команды некорректен
     """
-    pattern = r'info\s+(\w+)'
-    match = re.match(pattern, command, re.IGNORECASE)
+    match = _INFO_RE.match(command)
     
     if not match:
         raise ParseError(
@@ -0,0 +1,260 @@
+"""Хранение данных таблиц по столбцам."""
+
+import sys
+from bisect import bisect_left, insort
+from itertools import compress, repeat
+from operator import eq, lt
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set
+
+from .utils import encode_deletion, encode_record
+
+
+class TableStore:
+    """
+    Данные таблицы, хранящиеся по столбцам.
+    
+    Каждый столбец - отдельный список значений, а строка таблицы - позиция
+    в этих списках. Поиск по условию проходит по одному списку значений
+    вместо словаря на каждую запись, а словари записей создаются только
+    для строк, которые возвращаются пользователю.
+    """
+    
+    def __init__(self, column_names: Sequence[str]):
+        """
+        Инициализировать пустое хранилище.
+        
+        Args:
+            column_names: Имена столбцов таблицы, включая ID
+        """
+        self.column_names: List[str] = [sys.intern(name) for name in column_names]
+        self.columns: Dict[str, List[Any]] = {
+            name: [] for name in self.column_names
+        }
+        # Хеш-индексы: столбец -> значение -> позиции строк по возрастанию
+        self._indexes: Dict[str, Dict[Any, List[int]]] = {}
+        # Столбцы, по которым уже был поиск без индекса
+        self._scanned: Set[str] = set()
+        # Наибольший ID в таблице, чтобы не искать его при каждой вставке
+        self.max_id = 0
+        # Сериализованные строки для сохранения; None - строка загружена
+        # с диска и будет сериализована при первой перезаписи журнала
+        self._encoded: List[Optional[bytes]] = []
+        # Строки, которые нужно дописать в журнал при следующем сохранении
+        self._pending: List[bytes] = []
+        # Количество строк в журнале на диске; None - журнала ещё нет
+        self.log_length: Optional[int] = None
+        # ID строго возрастают по позициям, поиск по ID идёт бинарным поиском
+        self._ids_sorted = True
+    
+    @classmethod
+    def from_records(
+        cls, column_names: Sequence[str], records: List[Dict[str, Any]]
+    ) -> "TableStore":
+        """
+        Создать хранилище из списка записей (словарей).
+        
+        Args:
+            column_names: Имена столбцов таблицы, включая ID
+            records: Записи в порядке ID
+        
+        Returns:
+            Заполненное хранилище
+        """
+        store = cls(column_names)
+        for name, values in store.columns.items():
+            values.extend([record.get(name) for record in records])
+        ids = store.columns["ID"]
+        store.max_id = max(ids, default=0)
+        store._ids_sorted = all(map(lt, ids, ids[1:]))
+        store._encoded = [None] * len(records)
+        return store
+    
+    def __len__(self) -> int:
+        """Количество строк в таблице."""
+        return len(self.columns["ID"])
+    
+    def rows(self, positions: Optional[Iterable[int]] = None) -> List[Dict[str, Any]]:
+        """
+        Собрать записи (словари) для указанных строк.
+        
+        Args:
+            positions: Позиции строк; если не указаны - все строки
+        
+        Returns:
+            Список новых словарей записей
+        """
+        names = self.column_names
+        columns = [self.columns[name] for name in names]
+        
+        if positions is None:
+            return [dict(zip(names, values)) for values in zip(*columns)]
+        
+        return [
+            dict(zip(names, [column[position] for column in columns]))
+            for position in positions
+        ]
+    
+    def encoded_rows(self) -> List[bytes]:
+        """
+        Получить все строки, сериализованные для записи в файл.
+        
+        Сериализуются только строки, загруженные с диска и ещё
+        не сериализованные, остальные берутся готовыми.
+        
+        Returns:
+            Сериализованные строки в порядке таблицы
+        """
+        encoded = self._encoded
+        stale = [position for position, row in enumerate(encoded) if row is None]
+        for position, record in zip(stale, self.rows(stale)):
+            encoded[position] = encode_record(record)
+        return encoded
+    
+    def pending_rows(self) -> List[bytes]:
+        """
+        Получить строки журнала, накопленные с предыдущего сохранения.
+        
+        Строки остаются в очереди до вызова clear_pending, чтобы
+        не потерять их, если запись на диск не удалась.
+        
+        Returns:
+            Строки журнала в порядке изменений
+        """
+        return self._pending
+    
+    def clear_pending(self, count: int) -> None:
+        """
+        Убрать из очереди строки журнала, уже записанные на диск.
+        
+        Args:
+            count: Количество записанных строк с начала очереди
+        """
+        del self._pending[:count]
+    
+    def find(self, column: str, value: Any) -> List[int]:
+        """
+        Найти позиции строк, у которых значение столбца равно value.
+        
+        Первый поиск по столбцу просматривает его значения сравнением
+        через map(eq), без построения индекса. Хеш-индекс строится
+        только при повторном поиске по тому же столбцу.
+        
+        Args:
+            column: Имя столбца
+            value: Искомое значение
+        
+        Returns:
+            Позиции строк по возрастанию
+        """
+        if column == "ID" and self._ids_sorted:
+            ids = self.columns["ID"]
+            position = bisect_left(ids, value)
+            if position < len(ids) and ids[position] == value:
+                return [position]
+            return []
+        
+        if column not in self._indexes and column not in self._scanned:
+            self._scanned.add(column)
+            values = self.columns[column]
+            return list(compress(range(len(values)), map(eq, values, repeat(value))))
+        
+        return list(self._get_index(column).get(value, ()))
+    
+    def _get_index(self, column: str) -> Dict[Any, List[int]]:
+        """
+        Получить хеш-индекс столбца, построив его при первом обращении.
+        
+        Args:
+            column: Имя столбца
+        
+        Returns:
+            Словарь значение -> позиции строк
+        """
+        index = self._indexes.get(column)
+        if index is None:
+            index = {}
+            for position, value in enumerate(self.columns[column]):
+                index.setdefault(value, []).append(position)
+            self._indexes[column] = index
+        return index
+    
+    def append(self, record: Dict[str, Any]) -> None:
+        """
+        Добавить строку в конец таблицы.
+        
+        Args:
+            record: Запись со значениями всех столбцов
+        """
+        position = len(self)
+        if position and record["ID"] <= self.columns["ID"][-1]:
+            self._ids_sorted = False
+        for name, values in self.columns.items():
+            values.append(record.get(name))
+        encoded = encode_record(record)
+        self._encoded.append(encoded)
+        self._pending.append(encoded)
+        self.max_id = max(self.max_id, record["ID"])
+        
+        for column, index in self._indexes.items():
+            index.setdefault(record.get(column), []).append(position)
+    
+    def update(self, positions: Iterable[int], column: str, value: Any) -> None:
+        """
+        Записать значение в столбец указанных строк.
+        
+        Args:
+            positions: Позиции строк
+            column: Имя столбца
+            value: Новое значение
+        """
+        positions = list(positions)
+        values = self.columns[column]
+        index = self._indexes.get(column)
+        if column == "ID" and positions:
+            self._ids_sorted = False
+        
+        for position in positions:
+            if index is not None:
+                old_value = values[position]
+                bucket = index[old_value]
+                del bucket[bisect_left(bucket, position)]
+                if not bucket:
+                    del index[old_value]
+                insort(index.setdefault(value, []), position)
+            values[position] = value
+        
+        # Новые версии записей дописываются в журнал целиком
+        for position, record in zip(positions, self.rows(positions)):
+            encoded = encode_record(record)
+            self._encoded[position] = encoded
+            self._pending.append(encoded)
+    
+    def delete(self, positions: Iterable[int]) -> None:
+        """
+        Удалить указанные строки.
+        
+        Args:
+            positions: Позиции строк
+        """
+        to_delete = sorted(set(positions))
+        if not to_delete:
+            return
+        
+        ids = self.columns["ID"]
+        self._pending.extend([encode_deletion(ids[position]) for position in to_delete])
+        
+        # Сдвинуть уцелевшие участки между удаляемыми строками к началу
+        # списка срезами и отрезать хвост, не копируя весь столбец
+        length = len(self)
+        bounds = list(zip(to_delete, to_delete[1:] + [length]))
+        for values in [*self.columns.values(), self._encoded]:
+            write = to_delete[0]
+            for position, end in bounds:
+                kept = values[position + 1:end]
+                values[write:write + len(kept)] = kept
+                write += len(kept)
+            del values[write:]
+        self.max_id = max(self.columns["ID"], default=0)
+        
+        # Позиции оставшихся строк сдвинулись, индексы построятся заново
+        self._indexes.clear()
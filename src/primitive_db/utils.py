@@ -1,9 +1,76 @@
 import json
 import os
-from typing import Any, Dict, List
+import re
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 
 from .constants import DATA_DIR
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# orjson читает целые числа длиннее 64 бит как float, такие файлы
+# разбираются стандартным модулем json
+_LONG_NUMBER_RE = re.compile(rb"\d{20}")
+
+
+def _loads(raw: bytes) -> Any:
+    """
+    Разобрать JSON из байтов, используя orjson при его наличии.
+    
+    Args:
+        raw: Содержимое JSON файла
+        
+    Returns:
+        Разобранные данные
+    """
+    if orjson is not None and _LONG_NUMBER_RE.search(raw) is None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+def _dumps(data: Any, indent: bool = True) -> bytes:
+    """
+    Сериализовать данные в JSON.
+    
+    orjson не поддерживает целые числа длиннее 64 бит, для таких данных
+    используется стандартный модуль json.
+    
+    Args:
+        data: Данные для сериализации
+        indent: Отступ в 2 пробела; иначе JSON в одну строку
+        
+    Returns:
+        JSON в кодировке UTF-8
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(data, option=orjson.OPT_INDENT_2 if indent else 0)
+        except TypeError:
+            pass
+    if indent:
+        return json.dumps(data, ensure_ascii=False, indent=2).encode('utf-8')
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode('utf-8')
+
+
+def _write_atomic(filepath: str, content: bytes) -> None:
+    """
+    Записать файл целиком одной операцией записи и атомарной заменой.
+    
+    Данные пишутся во временный файл рядом с целевым, который затем
+    заменяет старый через os.replace, поэтому сбой во время записи
+    не оставляет файл обрезанным.
+    
+    Args:
+        filepath: Путь к файлу
+        content: Новое содержимое файла
+    """
+    tmp_filepath = f"{filepath}.tmp"
+    with open(tmp_filepath, 'wb') as f:
+        f.write(content)
+    os.replace(tmp_filepath, filepath)
+
 
 def load_metadata(filepath: str) -> dict:
     """
@@ -16,8 +83,8 @@ def load_metadata(filepath: str) -> dict:
         Dictionary with metadata or empty dict if file not found
     """
     try:
-        with open(filepath, 'r', encoding='utf-8') as f:
-            return json.load(f)
+        with open(filepath, 'rb') as f:
+            return _loads(f.read())
     except FileNotFoundError:
         return {}
 
@@ -30,44 +97,165 @@ def save_metadata(filepath: str, data: dict) -> None:
         filepath: Path to the JSON file
         data: Dictionary with metadata to save
     """
-    with open(filepath, 'w', encoding='utf-8') as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
+    _write_atomic(filepath, _dumps(data))
 
 
-def load_table_data(table_name: str) -> List[Dict[str, Any]]:
+def _table_path(table_name: str) -> str:
+    """Путь к журналу данных таблицы (JSON Lines)."""
+    return os.path.join(DATA_DIR, f"{table_name}.jsonl")
+
+
+def _legacy_table_path(table_name: str) -> str:
+    """Путь к файлу данных таблицы в прежнем формате (JSON массив)."""
+    return os.path.join(DATA_DIR, f"{table_name}.json")
+
+
+def _replay_log(raw: bytes) -> Tuple[List[Dict[str, Any]], Optional[int]]:
+    """
+    Применить строки журнала таблицы по порядку.
+    
+    Каждая строка журнала - либо запись целиком (вставка или новая версия
+    после обновления), либо ID удалённой записи. Новая версия записи
+    остаётся на месте прежней.
+    
+    Каждая дописанная строка заканчивается переводом строки, поэтому
+    последний фрагмент без него - оборванная запись. Он отбрасывается,
+    даже если разбирается как JSON: оборванная отметка об удалении
+    (например, 5 вместо 57) остаётся корректным числом.
+    
+    Args:
+        raw: Содержимое журнала
+        
+    Returns:
+        Список записей и количество строк в журнале (None, если последняя
+        строка оборвана и журнал нужно перезаписать целиком)
+    """
+    lines = raw.split(b"\n")
+    torn = lines.pop() != b""
+    
+    records: Dict[int, Dict[str, Any]] = {}
+    for line in lines:
+        item = _loads(line)
+        if isinstance(item, dict):
+            records[item["ID"]] = item
+        else:
+            records.pop(item, None)
+    
+    # При следующем сохранении оборванный журнал будет перезаписан целиком
+    return list(records.values()), None if torn else len(lines)
+
+
+def read_table_log(table_name: str) -> Tuple[List[Dict[str, Any]], Optional[int]]:
     """
-    Загрузить данные таблицы из JSON файла.
+    Загрузить данные таблицы из журнала JSON Lines.
+    
+    Если журнала нет, читается файл в прежнем формате JSON массива.
     
     Args:
         table_name: Имя таблицы
         
     Returns:
-        Список записей (словарей) или пустой список если файл не найден
+        Список записей и количество строк в журнале (None, если журнала
+        нет или он оборван и при сохранении его нужно записать целиком)
     """
-    filepath = os.path.join(DATA_DIR, f"{table_name}.json")
+    try:
+        with open(_table_path(table_name), 'rb') as f:
+            return _replay_log(f.read())
+    except FileNotFoundError:
+        pass
     
     try:
-        with open(filepath, 'r', encoding='utf-8') as f:
-            return json.load(f)
+        with open(_legacy_table_path(table_name), 'rb') as f:
+            return _loads(f.read()), None
     except FileNotFoundError:
-        return []
+        return [], None
 
 
-def save_table_data(table_name: str, data: List[Dict[str, Any]]) -> None:
+def load_table_data(table_name: str) -> List[Dict[str, Any]]:
     """
-    Сохранить данные таблицы в JSON файл.
+    Загрузить данные таблицы.
     
     Args:
         table_name: Имя таблицы
-        data: Список записей (словарей) для сохранения
+        
+    Returns:
+        Список записей (словарей) или пустой список если файл не найден
+    """
+    return read_table_log(table_name)[0]
+
+
+def encode_record(record: Dict[str, Any]) -> bytes:
+    """
+    Сериализовать запись в строку журнала таблицы.
+    
+    Args:
+        record: Запись (словарь)
+        
+    Returns:
+        JSON записи в одну строку
+    """
+    return _dumps(record, indent=False)
+
+
+def encode_deletion(record_id: int) -> bytes:
+    """
+    Сериализовать отметку об удалении записи в строку журнала таблицы.
+    
+    Args:
+        record_id: ID удалённой записи
+        
+    Returns:
+        ID записи в виде JSON числа
+    """
+    return str(record_id).encode('utf-8')
+
+
+def append_table_rows(table_name: str, rows: Sequence[bytes]) -> None:
+    """
+    Дописать строки в конец журнала таблицы.
+    
+    Args:
+        table_name: Имя таблицы
+        rows: Строки журнала (encode_record или encode_deletion)
+    """
+    if not rows:
+        return
+    
+    # Режим 'ab' открывает файл с O_APPEND: каждая запись идёт в конец
+    with open(_table_path(table_name), 'ab') as f:
+        f.write(b"\n".join(rows) + b"\n")
+
+
+def save_table_rows(table_name: str, rows: Sequence[bytes]) -> None:
+    """
+    Перезаписать журнал таблицы только текущими записями (компактировать).
+    
+    Args:
+        table_name: Имя таблицы
+        rows: Записи, сериализованные через encode_record
     """
     # Создать директорию data если она не существует
     os.makedirs(DATA_DIR, exist_ok=True)
     
-    filepath = os.path.join(DATA_DIR, f"{table_name}.json")
+    content = b"\n".join(rows) + b"\n" if rows else b""
+    _write_atomic(_table_path(table_name), content)
+    
+    # Данные перенесены в журнал, файл прежнего формата больше не нужен
+    try:
+        os.remove(_legacy_table_path(table_name))
+    except FileNotFoundError:
+        pass
+
+
+def save_table_data(table_name: str, data: List[Dict[str, Any]]) -> None:
+    """
+    Сохранить данные таблицы.
     
-    with open(filepath, 'w', encoding='utf-8') as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
+    Args:
+        table_name: Имя таблицы
+        data: Список записей (словарей) для сохранения
+    """
+    save_table_rows(table_name, [encode_record(record) for record in data])
 
 
 def delete_table_data(table_name: str) -> None:
@@ -77,9 +265,8 @@ def delete_table_data(table_name: str) -> None:
     Args:
         table_name: Имя таблицы
     """
-    filepath = os.path.join(DATA_DIR, f"{table_name}.json")
-    
-    try:
-        os.remove(filepath)
-    except FileNotFoundError:
-        pass  # Файл уже не существует
\ No newline at end of file
+    for filepath in (_table_path(table_name), _legacy_table_path(table_name)):
+        try:
+            os.remove(filepath)
+        except FileNotFoundError:
+            pass  # Файл уже не существует
\ No newline at end of file